@@ -0,0 +1,127 @@
+# benchmark of the figure pipeline (parsing, statistics, drawing, savefig) on synthetic data
+# example :
+#   python benchmark.py --scales 30x1000 300x10000 --output bench.json
+#   python benchmark.py --scales 30x1000 --output new.json --compare bench.json
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import time
+
+import numpy as np
+
+import paperplot
+
+
+def write_experiment(dir, n_runs, n_generations, seed=0):
+    """Write n_runs synthetic bestfit.dat files in dir/exp_*/node*/ (same layout as data/)."""
+    rng = np.random.default_rng(seed)
+    gens = np.arange(n_generations)
+    for i in range(n_runs):
+        run_dir = os.path.join(dir, 'exp_%d' % i, 'node%02d_2014-07-15_16_42_46_%d' % (i % 12, 10000 + i))
+        os.makedirs(run_dir)
+        # a noisy increasing fitness, like the best fitness of an evolutionary algorithm
+        fitness = np.maximum.accumulate(-5000 + np.cumsum(rng.exponential(5000.0 / n_generations, n_generations)))
+        np.savetxt(os.path.join(run_dir, 'bestfit.dat'), np.column_stack((gens, fitness)), fmt=['%d', '%g'])
+
+
+def timed(func, repeat):
+    # best wall time of `repeat` calls, and the result of the last one
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def bench_scale(dir, repeat, workers):
+    times = {}
+    times['load'], data = timed(lambda: paperplot.load(dir, workers=workers), repeat)
+    times['perc'], stats = timed(lambda: paperplot.perc(data), repeat)
+    x = np.arange(data.shape[1])
+
+    def draw():
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        fig = paperplot.new_figure()
+        ax = fig.add_subplot(111)
+        paperplot.style_axes(ax)
+        paperplot.plot_band(ax, x, *stats, color='#B22400')
+        # render with Agg, without encoding any file (the default canvas of
+        # a Figure does not draw anything)
+        FigureCanvasAgg(fig).draw()
+        return fig
+    # import matplotlib, palettable and the backend outside of the timed calls
+    draw()
+    times['draw'], fig = timed(draw, repeat)
+    out = os.path.join(dir, 'bench.png')
+    times['savefig'], _ = timed(lambda: fig.savefig(out), repeat)
+    return times
+
+
+def revision():
+    # the revision of the repository of this script, wherever it is run from
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       cwd=os.path.dirname(os.path.abspath(__file__)),
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, reference):
+    # print the ratio new / reference for each scale and stage found in both files
+    ref = dict(((r['runs'], r['generations']), r['times']) for r in reference['results'])
+    for r in results['results']:
+        key = (r['runs'], r['generations'])
+        if key not in ref:
+            continue
+        for stage, t in sorted(r['times'].items()):
+            if stage in ref[key]:
+                print('%dx%d %-8s %8.4fs -> %8.4fs  x%.2f'
+                      % (key[0], key[1], stage, ref[key][stage], t, t / ref[key][stage]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of the paperplot pipeline on synthetic data.')
+    parser.add_argument('--scales', nargs='+', default=['30x1000', '100x10000'],
+                        help='runs x generations of each synthetic experiment')
+    parser.add_argument('--repeat', type=int, default=3, help='the best of REPEAT runs is kept')
+    parser.add_argument('--workers', type=int, default=1, help='workers of load()')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--compare', help='compare the results with this JSON file')
+    args = parser.parse_args()
+
+    results = {
+        'revision': revision(),
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'workers': args.workers,
+        'results': [],
+    }
+    root = tempfile.mkdtemp(prefix='paperplot_bench_')
+    try:
+        for scale in args.scales:
+            n_runs, n_generations = [int(v) for v in scale.split('x')]
+            dir = os.path.join(root, scale)
+            write_experiment(dir, n_runs, n_generations)
+            times = bench_scale(dir, args.repeat, args.workers)
+            results['results'].append({'runs': n_runs, 'generations': n_generations, 'times': times})
+            print('%s: %s' % (scale, ', '.join('%s %.4fs' % (k, v) for k, v in sorted(times.items()))))
+    finally:
+        shutil.rmtree(root)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=1)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
@@ -20,12 +20,12 @@ rcParams.update(params)
 
 def load(dir):
     f_list = glob.glob(dir + '/*/*/bestfit.dat')
-    num_lines = sum(1 for line in open(f_list[0]))
-    i = 0
-    data = np.zeros((len(f_list), num_lines))
-    for f in f_list:
-        data[i, :] = np.loadtxt(f)[:, 1]
-        i += 1
+    # read each file once (second column only); the runs that crashed or are
+    # still running are shorter: their missing generations are NaN
+    runs = [np.loadtxt(f, ndmin=2, usecols=1)[:, 0] for f in f_list]
+    data = np.full((len(runs), max(len(r) for r in runs)), np.nan)
+    for i, r in enumerate(runs):
+        data[i, :len(r)] = r
     return data
 
 
@@ -44,8 +44,9 @@ def stars(p):
 
 data_low_mut = load('data/low_mut')
 data_high_mut = load('data/high_mut')
-low_mut_100 = data_low_mut[:, 100]
-high_mut_100 = data_high_mut[:, 100]
+# the runs that stopped before generation 100 are left out
+low_mut_100 = data_low_mut[:, 100][~np.isnan(data_low_mut[:, 100])]
+high_mut_100 = data_high_mut[:, 100][~np.isnan(data_high_mut[:, 100])]
 
 fig = figure()
 ax = fig.add_subplot(111)
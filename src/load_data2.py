@@ -7,22 +7,19 @@ from pylab import *
 
 def load(dir):
     # a simple function to load our files
-    # we assume that each file has the same number of rows (generations)
     # example : exp_9/node05_2014-07-15_16_42_48_5178/bestfit.dat
     f_list = glob.glob(dir + '/*/*/bestfit.dat')
 
-    # get the number of lines of the first file, to know the size of the matrix
-    num_lines = sum(1 for line in open(f_list[0]))
+    # read each file only once (we ignore the first column of the file);
+    # ndmin=2 keeps a matrix even for an empty file or a single line
+    runs = [np.loadtxt(f, ndmin=2, usecols=1)[:, 0] for f in f_list]
 
-    # be careful that np.zeros takes a tuple as argument (size1, size)
-    # therefore we need two parentheses
-    i = 0
-    data = np.zeros((len(f_list), num_lines))
-
-    for f in f_list:
-        # we ignore the first column of the file
-        data[i, :] = np.loadtxt(f)[:, 1]
-        i += 1
+    # the runs that crashed or are still running are shorter: we fill their
+    # missing generations with NaN (not a number), so that we get a matrix
+    # (runs x generations) as long as the longest run
+    data = np.full((len(runs), max(len(r) for r in runs)), np.nan)
+    for i, r in enumerate(runs):
+        data[i, :len(r)] = r
     return data
 
 
@@ -0,0 +1,50 @@
+# render several figures of the tutorial in one go, using the paperplot package
+import numpy as np
+
+from paperplot import Job, colors, med, perc, plot_band, plot_grid, render, style_axes, white_legend
+
+
+def draw_variance(fig, data_low_mut, data_high_mut):
+    c = colors()
+    x = np.arange(0, data_low_mut.shape[1])
+    ax = fig.add_subplot(111)
+    style_axes(ax)
+    line_low_mut, _ = plot_band(ax, x, *perc(data_low_mut), color=c[0])
+    line_high_mut, _ = plot_band(ax, x, *perc(data_high_mut), color=c[1], linestyle='--')
+    ax.set_xlim(-5, 400)
+    ax.set_ylim(-5000, 300)
+    ax.set_xticks(np.arange(0, 500, 100))
+    white_legend(ax, [line_low_mut, line_high_mut], ["Low mutation rate", "High Mutation rate"])
+
+
+def draw_medians(fig, data_low_mut, data_high_mut):
+    c = colors()
+    x = np.arange(0, data_low_mut.shape[1])
+    ax = fig.add_subplot(111)
+    style_axes(ax)
+    line_low_mut, = ax.plot(x, med(data_low_mut), linewidth=2, color=c[0])
+    line_high_mut, = ax.plot(x, med(data_high_mut), linewidth=2, linestyle='--', color=c[1])
+    ax.set_xlim(-5, 400)
+    ax.set_ylim(-5000, 300)
+    ax.set_xticks(np.arange(0, 500, 100))
+    white_legend(ax, [line_low_mut, line_high_mut], ["Low mutation rate", "High Mutation rate"])
+
+
+def draw_variance_subplots(fig, data_low_mut, data_high_mut):
+    # the statistics are computed once and each panel only gets the part it shows
+    stats = {'low_mut': perc(data_low_mut), 'high_mut': perc(data_high_mut)}
+    fig.subplots_adjust(left=0.09, right=0.99, top=0.95, wspace=0.1)
+    plot_grid(fig, stats, windows=[(0, 500), (0, 110)], rows=[['low_mut', 'high_mut']],
+              labels={'low_mut': "Low mutation rate", 'high_mut': "High Mutation rate"},
+              ylim=(-5000, 300), xtick_step=100)
+
+
+conditions = ('data/low_mut', 'data/high_mut')
+jobs = [
+    Job('variance_matplotlib.png', draw_variance, conditions),
+    Job('medians3.png', draw_medians, conditions),
+    Job('variance_subplot_ter', draw_variance_subplots, conditions, figsize=[7, 4], formats=['png', 'pdf']),
+]
+
+if __name__ == '__main__':
+    render(jobs, cache_dir='.paperplot_figures')
@@ -0,0 +1,22 @@
+# shared helpers for the scripts of this tutorial
+# example : from paperplot import load, perc
+#
+# importing paperplot only imports numpy: matplotlib, scipy and palettable
+# are imported by the functions that need them, so that data-only jobs
+# (e.g. computing medians for a report) start quickly and never load pyplot.
+from .data import list_runs, load, load_aligned, load_file, load_files, load_ragged, parse_bestfit
+from .cache import load_cached
+from .stats import bootstrap_median, med, perc, quantiles
+from .archive import load_tar, load_tar_all
+from .follow import Follower
+from .sketch import QuantileSketch, perc_streaming
+from .signif import adjust_pvalues, mannwhitney, mannwhitney_generations, pairwise, stars, stars_array
+from .style import colors, params, update_params
+from .plots import draw_brackets, new_figure, plot_band, plot_conditions, shade_significance, style_axes, white_legend
+from .batch import Job, render
+from .decimate import band_envelope, lttb, minmax
+from .instrument import profiling, stage
+from .manifest import Manifest, Run
+from .conditions import discover, summarize
+from .export import rasterize_layers, savefig_many, savefig_rasterized
+from .grid import plot_grid
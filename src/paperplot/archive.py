@@ -0,0 +1,59 @@
+# loading the experiments directly from a tar (or tar.gz, tar.bz2...) archive
+# example : data.tar.gz contains data/low_mut/exp_0/node04_2014-07-15_16_42_46_11616/bestfit.dat
+import tarfile
+
+from .data import _check_lengths, _mask_padding, fill_rows, load_file
+
+
+def _condition(name):
+    # 'data/low_mut/exp_0/node04_.../bestfit.dat' -> 'data/low_mut'
+    parts = name.split('/')
+    if parts[0] == '.':
+        parts = parts[1:]
+    if len(parts) < 4 or parts[-1] != 'bestfit.dat':
+        return None
+    return '/'.join(parts[:-3])
+
+
+def load_tar_all(archive, dirs=None, ragged=False, dtype=float, columns=1):
+    """Load every condition of a tar archive in a single sequential pass.
+
+    Return a dictionary {dir: matrix}, where dir is the path of the condition
+    inside the archive (e.g. 'data/low_mut') and matrix is what load(dir)
+    would return on the extracted archive. `dirs` restricts the loading to
+    some conditions. With ragged=True, each value is the (masked matrix,
+    lengths) pair of load_ragged(). dtype and columns are the same as in load().
+    """
+    runs = {}
+    # 'r|*' reads the archive as a stream: no seek, no extraction
+    with tarfile.open(archive, mode='r|*') as tar:
+        for member in tar:
+            if not member.isfile():
+                continue
+            dir = _condition(member.name)
+            if dir is None or (dirs is not None and dir not in dirs):
+                continue
+            try:
+                runs.setdefault(dir, {})[member.name] = load_file(tar.extractfile(member), columns)
+            except ValueError as e:
+                raise ValueError('%s in %s: %s' % (member.name, archive, e)) from None
+
+    result = {}
+    for dir, rows in runs.items():
+        # same order as load(), which sorts the file names
+        f_list = sorted(rows)
+        data, lengths = fill_rows((rows[f] for f in f_list), len(f_list), dtype)
+        if ragged:
+            result[dir] = (_mask_padding(data, lengths), lengths)
+        else:
+            _check_lengths(f_list, data, lengths)
+            result[dir] = data
+    return result
+
+
+def load_tar(archive, dir, ragged=False, dtype=float, columns=1):
+    """Load one condition (e.g. 'data/low_mut') from a tar archive, like load(dir)."""
+    result = load_tar_all(archive, [dir], ragged, dtype, columns)
+    if dir not in result:
+        raise KeyError('no %s/*/*/bestfit.dat in %s' % (dir, archive))
+    return result[dir]
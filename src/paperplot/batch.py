@@ -0,0 +1,133 @@
+# rendering many figures in a single process (or a single pool of processes)
+# example :
+#   def draw_variance(fig, data_low_mut, data_high_mut):
+#       ax = fig.add_subplot(111)
+#       [...]
+#   render([Job('variance.png', draw_variance, ('data/low_mut', 'data/high_mut'))])
+import functools
+import os
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from . import figcache
+from .cache import load_cached
+from .data import _map
+from .export import output_names, savefig_many
+from .instrument import profiling, stage
+from .plots import new_figure
+from .style import update_params
+
+# output: file name given to savefig() (without extension if formats is given)
+# draw: a function draw(fig, *datasets); it must be defined at the top level of
+#       a module so that it can be sent to the worker processes
+# data: the directories of the datasets passed to draw()
+# figsize: passed to update_params() (None for the default size)
+# formats: None, or the formats given to savefig_many() to export the figure,
+#          drawn once, in several formats, e.g. ['png', 'pdf', 'svg']
+Job = namedtuple('Job', ['output', 'draw', 'data', 'figsize', 'formats'])
+Job.__new__.__defaults__ = ((), None, None)
+
+# the datasets already loaded by this process
+_datasets = {}
+
+
+def dataset(dir, dtype=float):
+    """Return the matrix of `dir`, loading it (through the cache) only once per process."""
+    key = (dir, np.dtype(dtype).name)
+    if key not in _datasets:
+        _datasets[key] = load_cached(dir, dtype=dtype)
+    return _datasets[key]
+
+
+def job_outputs(job):
+    """The files written by a job."""
+    if job.formats is None:
+        return [job.output]
+    return [fname for _, _, fname in output_names(job.output, job.formats)]
+
+
+def count_artists(fig):
+    return sum(len(ax.lines) + len(ax.collections) + len(ax.patches) + len(ax.texts) for ax in fig.axes)
+
+
+def render_job(job, profile_dir=None, dtype=float):
+    """Draw and save one figure; return (output, wall time in seconds).
+
+    If profile_dir is given, the stages of the job (see paperplot.instrument)
+    are saved to profile_dir/<output>.json. The datasets already loaded by
+    this process are not loaded again: with render(), the loading stages
+    are in profile_dir/load.json.
+    """
+    start = time.perf_counter()
+    if profile_dir is None:
+        _render(job, dtype)
+    else:
+        output = os.path.join(profile_dir, os.path.basename(job.output) + '.json')
+        with profiling(job.output, output):
+            _render(job, dtype)
+    return job.output, time.perf_counter() - start
+
+
+def _render(job, dtype):
+    update_params(job.figsize)
+    with stage('load', datasets=len(job.data)):
+        datasets = [dataset(dir, dtype) for dir in job.data]
+    with stage('draw') as counts:
+        fig = new_figure()
+        job.draw(fig, *datasets)
+        counts['artists'] = count_artists(fig)
+    with stage('savefig'):
+        if job.formats is None:
+            fig.savefig(job.output)
+        else:
+            savefig_many(fig, job.output, job.formats)
+
+
+def render(jobs, workers=None, verbose=True, profile_dir=None, cache_dir=None, dtype=float):
+    """Render all the jobs, on `workers` processes (None: one per core, 1: no pool).
+
+    Each dataset is loaded once, before starting the workers: the workers then
+    share the memory-mapped cache (see load_cached()) instead of parsing the
+    text files again. Return the list of (output, wall time) in job order.
+    With profile_dir, a JSON profile of each figure is written in this directory,
+    and the profile of the loading of the datasets (the 'glob', 'parse',
+    'fingerprint' and 'cache' stages) in profile_dir/load.json.
+    dtype is the type of the cached matrices (e.g. np.float32, see load()).
+
+    With cache_dir, each rendered figure is also stored in this directory
+    under the hash of its data, style and code (see paperplot.figcache); a
+    job whose hash is already there is copied from the cache instead of
+    being drawn again (its wall time is reported as None).
+    """
+    jobs = list(jobs)
+    results = [None] * len(jobs)
+    todo = list(range(len(jobs)))
+    if cache_dir is not None:
+        keys = [figcache.job_key(job, dtype) for job in jobs]
+        todo = [i for i in todo if not figcache.fetch(cache_dir, job_outputs(jobs[i]), keys[i])]
+        for i in set(range(len(jobs))) - set(todo):
+            results[i] = (jobs[i].output, None)
+
+    dirs = sorted(set(dir for i in todo for dir in jobs[i].data))
+    if profile_dir is None:
+        for dir in dirs:
+            dataset(dir, dtype)
+    else:
+        if not os.path.isdir(profile_dir):
+            os.makedirs(profile_dir)
+        with profiling('load', os.path.join(profile_dir, 'load.json')):
+            for dir in dirs:
+                with stage('load', dir=dir):
+                    dataset(dir, dtype)
+    job = functools.partial(render_job, profile_dir=profile_dir, dtype=dtype)
+    for i, result in zip(todo, _map(job, [jobs[i] for i in todo], workers, processes=True)):
+        results[i] = result
+        if cache_dir is not None:
+            figcache.store(cache_dir, job_outputs(jobs[i]), keys[i])
+
+    if verbose:
+        for output, t in results:
+            print('%s: %s' % (output, 'cached' if t is None else '%.2fs' % t))
+    return results
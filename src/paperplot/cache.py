@@ -0,0 +1,80 @@
+# binary cache of the loaded matrices, stored next to the data
+# example : data/low_mut/.paperplot_cache.float64.npy
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from .data import list_runs, load
+from .instrument import stage
+
+CACHE_NAME = '.paperplot_cache'
+
+
+def fingerprint(f_list):
+    """Hash the names, mtimes and sizes of the files (in glob order)."""
+    h = hashlib.sha1()
+    for f in f_list:
+        st = os.stat(f)
+        h.update(('%s\t%d\t%d\n' % (f, st.st_mtime_ns, st.st_size)).encode())
+    return {'files': len(f_list), 'hash': h.hexdigest()}
+
+
+def _write_atomic(path, write):
+    # write to a temporary file first so that a crash never leaves a half-written cache
+    tmp = '%s.%d.tmp' % (path, os.getpid())
+    try:
+        with open(tmp, 'wb') as f:
+            write(f)
+        os.replace(tmp, path)
+    except OSError:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def load_cached(dir, mmap_mode='r', dtype=float, columns=1, **kwargs):
+    """Like load(), but reuse the matrix saved by a previous call if no file changed.
+
+    The cache is invalidated when the number of files, or the mtime or size of
+    any file, changes. With mmap_mode='r' (the default) the cached matrix is
+    memory-mapped instead of read, even right after building the cache: all
+    the processes that plot the same data share it through the page cache.
+    Use mmap_mode=None to get a plain array. If the cache cannot be written
+    (e.g. a read-only directory), the freshly loaded matrix is returned.
+
+    Each dtype (see load()) has its own cache file, e.g. dtype=np.float32
+    gives a file (and a resident memory) half the size of the default float64.
+    Each selection of columns (see load()) also has its own file.
+    Other keyword arguments are passed to load().
+    """
+    name = CACHE_NAME + '.' + np.dtype(dtype).name
+    if columns != 1:
+        name += '.columns_' + '_'.join(str(c) for c in np.atleast_1d(columns))
+    npy = os.path.join(dir, name + '.npy')
+    meta = os.path.join(dir, name + '.json')
+    with stage('fingerprint') as counts:
+        key = fingerprint(list_runs(dir))
+        counts['files'] = key['files']
+
+    try:
+        with open(meta) as f:
+            if json.load(f) == key:
+                with stage('cache'):
+                    return np.load(npy, mmap_mode=mmap_mode)
+    except (OSError, ValueError):
+        # no cache yet, or a corrupted one: we simply rebuild it
+        pass
+
+    data = load(dir, dtype=dtype, columns=columns, **kwargs)
+    try:
+        _write_atomic(npy, lambda f: np.save(f, data))
+        _write_atomic(meta, lambda f: f.write(json.dumps(key).encode()))
+    except OSError:
+        # e.g. a read-only data directory (shared storage): work without cache
+        return data
+    if mmap_mode is not None:
+        # drop our private copy: the pages of the file can be shared
+        return np.load(npy, mmap_mode=mmap_mode)
+    return data
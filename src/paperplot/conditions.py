@@ -0,0 +1,41 @@
+# all the conditions of an experiment at once
+# example :
+#   stats = summarize('data')    # {'high_mut': (median, perc_25, perc_75), 'low_mut': (...)}
+#   for condition, (median, perc_25, perc_75) in stats.items():
+#       plot_band(ax, np.arange(len(median)), median, perc_25, perc_75, color=...)
+import functools
+import os
+
+from .data import _map, list_runs, load
+from .stats import perc
+
+
+def discover(root):
+    """Return the conditions of `root`, i.e. the sub-directories that contain */*/bestfit.dat files."""
+    conditions = []
+    for name in sorted(os.listdir(root)):
+        dir = os.path.join(root, name)
+        if not name.startswith('.') and os.path.isdir(dir) and list_runs(dir):
+            conditions.append(name)
+    return conditions
+
+
+def _summarize_one(dir, statistic, load_kwargs):
+    return statistic(load(dir, **load_kwargs))
+
+
+def summarize(root, conditions=None, statistic=perc, workers=None, processes=True, **load_kwargs):
+    """Load and summarize every condition of `root` concurrently.
+
+    Each condition is loaded (see load(); extra keyword arguments are passed
+    to it) and reduced by `statistic` (perc() by default, so that the values
+    are (median, perc_25, perc_75) tuples) in its own worker; only the
+    statistics are sent back, not the matrices. `conditions` restricts the
+    work to some conditions (default: all those found by discover()).
+    Return a dictionary {condition: statistics}, sorted by condition name.
+    """
+    if conditions is None:
+        conditions = discover(root)
+    job = functools.partial(_summarize_one, statistic=statistic, load_kwargs=load_kwargs)
+    dirs = [os.path.join(root, c) for c in conditions]
+    return dict(zip(conditions, _map(job, dirs, workers, processes)))
@@ -0,0 +1,233 @@
+# loading the bestfit.dat files of an experiment into a (runs x generations) matrix
+import functools
+import glob
+import io
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+from .instrument import stage
+
+
+def list_runs(dir):
+    # example : exp_9/node05_2014-07-15_16_42_48_5178/bestfit.dat
+    # sorted, so that the order of the runs does not depend on the file system
+    return sorted(glob.glob(dir + '/*/*/bestfit.dat'))
+
+
+def parse_bestfit(raw, columns=1):
+    """Parse the bytes of a bestfit.dat file ('gen value [value...]' on each line) in bulk.
+
+    `columns` is the index of the column to return (a 1D array), or a tuple
+    of indices (a (lines x len(columns)) array); only these columns are
+    converted to numbers, by the C parser of np.loadtxt() (numpy >= 1.23),
+    which is faster than splitting the bytes in Python. Return None if the
+    file is empty, if the lines do not all have the same number of fields
+    or if a value is not a number.
+    """
+    if not raw or raw.isspace():
+        return None
+    usecols = columns if np.ndim(columns) == 0 else tuple(columns)
+    try:
+        return np.loadtxt(io.BytesIO(raw), usecols=usecols, ndmin=1 if np.ndim(columns) == 0 else 2)
+    except ValueError:
+        return None
+
+
+def load_file(f, columns=1):
+    """Return the second column (or the `columns`) of a bestfit.dat file.
+
+    f is a file name or a binary file object. The file is read at once and
+    parsed by parse_bestfit(); what it rejects is given to np.loadtxt()
+    again, which returns nothing for an empty file (a crashed run) and
+    raises an error naming the faulty line otherwise.
+    """
+    if hasattr(f, 'read'):
+        raw = f.read()
+    else:
+        with open(f, 'rb') as fd:
+            raw = fd.read()
+    values = parse_bestfit(raw, columns)
+    if values is not None:
+        return values
+
+    # a crashed run can leave an empty file: numpy warns and returns nothing
+    usecols = columns if np.ndim(columns) == 0 else tuple(columns)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', UserWarning)
+        try:
+            d = np.loadtxt(io.BytesIO(raw), ndmin=2, usecols=usecols)
+        except ValueError as e:
+            # e.g. a column that the file does not have
+            if hasattr(f, 'read'):
+                raise
+            raise ValueError('%s: %s' % (f, e)) from None
+    if d.size == 0:
+        return np.zeros(0) if np.ndim(columns) == 0 else np.zeros((0, len(columns)))
+    # by default, we ignore the first column of the file
+    return d[:, 0] if np.ndim(columns) == 0 else d
+
+
+def _map(func, items, workers, processes):
+    # yield func(item) for each item, in order, possibly on a pool of workers
+    if workers == 1:
+        for item in items:
+            yield func(item)
+        return
+    if workers is None:
+        workers = os.cpu_count() or 1
+    pool = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    # big chunks amortize the cost of sending the results between processes
+    chunksize = max(1, len(items) // (4 * workers))
+    with pool(max_workers=workers) as executor:
+        for result in executor.map(func, items, chunksize=chunksize):
+            yield result
+
+
+def fill_rows(rows, n_rows, dtype=float):
+    """Store a sequence of rows into a NaN-padded (n_rows x max length) matrix.
+
+    The matrix is allocated from the length of the first row and only grown
+    when a longer row shows up, so each row is read only once.
+    Rows of shape (length x k) (several columns of a file) give a
+    (k x n_rows x max length) array, i.e. one matrix per column.
+    Return the matrix (of type dtype) and the length of each row.
+    """
+    data = np.zeros((n_rows, 0), dtype=dtype)
+    lengths = np.zeros(n_rows, dtype=int)
+    for i, row in enumerate(rows):
+        if i == 0 or len(row) > data.shape[-1]:
+            grown = np.full(row.shape[1:] + (n_rows, len(row)), np.nan, dtype=dtype)
+            grown[..., :data.shape[-1]] = data
+            data = grown
+        data[..., i, :len(row)] = row.T
+        lengths[i] = len(row)
+    return data, lengths
+
+
+def _check_lengths(f_list, data, lengths):
+    short = np.flatnonzero(lengths != data.shape[-1])
+    if len(short) > 0:
+        longest = np.argmax(lengths)
+        raise ValueError('%s has %d generations but %s has %d; use load_ragged() for unfinished runs'
+                         % (f_list[short[0]], lengths[short[0]], f_list[longest], lengths[longest]))
+
+
+def _mask_padding(data, lengths):
+    mask = np.arange(data.shape[-1]) >= lengths[:, np.newaxis]
+    return np.ma.MaskedArray(data, mask=np.broadcast_to(mask, data.shape))
+
+
+def _load_rows(dir, workers, processes, dtype, columns):
+    with stage('glob') as counts:
+        f_list = list_runs(dir)
+        counts['files'] = len(f_list)
+    return _parse_rows(f_list, workers, processes, dtype, columns)
+
+
+def _parse_rows(f_list, workers, processes, dtype, columns):
+    with stage('parse', files=len(f_list)) as counts:
+        parse = functools.partial(load_file, columns=columns)
+        data, lengths = fill_rows(_map(parse, f_list, workers, processes), len(f_list), dtype)
+        counts['generations'] = data.shape[-1]
+    return f_list, data, lengths
+
+
+def load(dir, workers=1, processes=False, dtype=float, columns=1):
+    """Load all the runs of `dir` into a (runs x generations) matrix.
+
+    With workers > 1 the files are parsed on a pool of threads (or of
+    processes if `processes` is True); workers=None uses one worker per core.
+    The rows are always in (sorted) glob order, whatever the number of workers.
+    All the runs must have the same length (see load_ragged() otherwise).
+
+    dtype=np.float32 halves the memory used by the matrix, which is usually
+    precise enough for a figure; np.float16 quarters it, but only keeps about
+    3 significant digits and cannot store values beyond +/-65504.
+
+    By default, only the second column of the files (the fitness) is loaded;
+    `columns` selects another column, or a tuple of columns to get one
+    matrix per column, e.g. best, mean = load(dir, columns=(1, 2)).
+    The other columns are never converted to numbers. Negative indices
+    count from the last column; a column that a file does not have raises
+    a ValueError naming the file.
+    """
+    f_list, data, lengths = _load_rows(dir, workers, processes, dtype, columns)
+    _check_lengths(f_list, data, lengths)
+    return data
+
+
+def load_files(f_list, workers=1, processes=False, dtype=float, columns=1):
+    """Like load(), but for a given list of bestfit.dat files (e.g. from a Manifest)."""
+    f_list, data, lengths = _parse_rows(list(f_list), workers, processes, dtype, columns)
+    _check_lengths(f_list, data, lengths)
+    return data
+
+
+def load_ragged(dir, workers=1, processes=False, dtype=float, columns=1):
+    """Load runs that may have different lengths (e.g. crashed or still running).
+
+    Return a masked (runs x generations) matrix, padded with masked NaNs up
+    to the longest run, and the number of generations of each run.
+    The functions of paperplot.stats ignore the masked values.
+    dtype and columns are the same as in load().
+    """
+    f_list, data, lengths = _load_rows(dir, workers, processes, dtype, columns)
+    return _mask_padding(data, lengths), lengths
+
+
+def _by_generation(row):
+    # (generations, values) of a run, sorted by generation; if a generation
+    # was logged twice (e.g. the run was resumed after a restart), the last
+    # logged value is kept
+    gens = row[::-1, 0]
+    gens, idx = np.unique(gens, return_index=True)
+    return gens, row[::-1, 1][idx]
+
+
+def load_aligned(dir, grid=None, interp='step', workers=1, processes=False, dtype=float):
+    """Load the runs of `dir` aligned on the generation numbers logged in the files.
+
+    Each run is placed on a common grid of generations: by default, the
+    sorted union of all the logged generations, so that runs that only log
+    every k-th generation give k times fewer columns (and no dense array is
+    built); `grid` can also be given explicitly (e.g. np.arange(0, 10000, 100)).
+    A grid point between two logged generations of a run takes the value of
+    the previous one (interp='step', the best fitness stays the same until
+    it changes), the linear interpolation (interp='linear'), or nothing
+    (interp=None). Grid points before the first or after the last logged
+    generation of a run are masked.
+
+    Return the grid (the x of the figures) and the masked (runs x grid) matrix.
+    """
+    if interp not in ('step', 'linear', None):
+        raise ValueError('interp must be \'step\', \'linear\' or None, not %r' % (interp,))
+    f_list = list_runs(dir)
+    parse = functools.partial(load_file, columns=(0, 1))
+    with stage('parse', files=len(f_list)):
+        runs = [_by_generation(row) for row in _map(parse, f_list, workers, processes)]
+    if grid is None:
+        grid = np.unique(np.concatenate([gens for gens, _ in runs])) if runs else np.zeros(0)
+        # generation numbers are integers (they were parsed as floats)
+        if np.all(grid == np.round(grid)):
+            grid = grid.astype(np.int64)
+    grid = np.asarray(grid)
+
+    data = np.full((len(runs), len(grid)), np.nan, dtype=dtype)
+    for i, (gens, values) in enumerate(runs):
+        if len(gens) == 0:
+            continue
+        inside = (grid >= gens[0]) & (grid <= gens[-1])
+        if interp == 'linear':
+            data[i, inside] = np.interp(grid[inside], gens, values)
+        elif interp == 'step':
+            # index of the last logged generation <= each grid point
+            pos = np.searchsorted(gens, grid[inside], side='right') - 1
+            data[i, inside] = values[pos]
+        else:
+            pos = np.searchsorted(gens, grid)
+            exact = inside & (gens[np.minimum(pos, len(gens) - 1)] == grid)
+            data[i, exact] = values[pos[exact]]
+    return grid, np.ma.masked_invalid(data)
@@ -0,0 +1,90 @@
+# reducing very long series to about the resolution of the axes before drawing them
+# example :
+#   n = axes_pixels(ax)
+#   ax.plot(*minmax(x, median, n))
+#   ax.fill_between(*band_envelope(x, perc_25, perc_75, n), step='post')
+import numpy as np
+
+
+def axes_pixels(ax):
+    """Width of the axes in pixels, at the dpi of the figure."""
+    return max(1, int(round(ax.get_window_extent().width)))
+
+
+def _bins(y, n_bins):
+    # reshape y into (n_bins x size) blocks, padded with the last value
+    size = int(np.ceil(len(y) / float(n_bins)))
+    n_bins = int(np.ceil(len(y) / float(size)))
+    padded = np.empty(n_bins * size, dtype=np.result_type(y, float))
+    padded[:len(y)] = y
+    padded[len(y):] = y[-1]
+    return padded.reshape(n_bins, size), size
+
+
+def minmax(x, y, n_bins):
+    """Keep the minimum and the maximum of y in each of n_bins bins, in their original order.
+
+    Drawn as a line at n_bins ~ the width of the axes in pixels, the result
+    looks exactly like the full series: every peak and every step is kept.
+    Series shorter than 2 * n_bins are returned unchanged.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if len(y) <= 2 * n_bins:
+        return x, y
+    blocks, size = _bins(y, n_bins)
+    start = np.arange(len(blocks)) * size
+    i_min = np.minimum(start + np.argmin(blocks, axis=1), len(y) - 1)
+    i_max = np.minimum(start + np.argmax(blocks, axis=1), len(y) - 1)
+    idx = np.sort(np.concatenate((i_min, i_max, [0, len(y) - 1])))
+    idx = idx[np.concatenate(([True], np.diff(idx) > 0))]
+    return x[idx], y[idx]
+
+
+def band_envelope(x, low, high, n_bins):
+    """Reduce a band (e.g. the 25/75 percentiles) to n_bins bins that cover it entirely.
+
+    Each bin keeps the minimum of `low` and the maximum of `high`, at the first
+    x of the bin (plus the last x), so that the decimated band is never
+    thinner than the original one. Return x, low, high for fill_between(..., step='post').
+    """
+    x = np.asarray(x)
+    low = np.asarray(low)
+    high = np.asarray(high)
+    if len(x) <= 2 * n_bins:
+        return x, low, high
+    blocks_low, size = _bins(low, n_bins)
+    blocks_high, _ = _bins(high, n_bins)
+    x_d = np.append(x[::size], x[-1])
+    low_d = blocks_low.min(axis=1)
+    high_d = blocks_high.max(axis=1)
+    return x_d, np.append(low_d, low_d[-1]), np.append(high_d, high_d[-1])
+
+
+def lttb(x, y, n_out):
+    """Largest-Triangle-Three-Buckets downsampling of (x, y) to n_out points.
+
+    LTTB (Steinarsson 2013) keeps the visual shape of a line with fewer points
+    than minmax(), but it may smooth out isolated peaks.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return x, y
+    # the first and last points are always kept; the others are split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    idx = np.zeros(n_out, dtype=int)
+    idx[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        # the average point of the next bucket (or the last point)
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        # keep the point that makes the largest triangle with a and the average
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + np.argmax(area)
+        idx[i + 1] = a
+    return x[idx], y[idx]
@@ -0,0 +1,85 @@
+# exporting figures for papers (PDF, SVG...) and slides
+# example :
+#   rasterize_layers(fig)
+#   fig.savefig('variance.pdf', dpi=300)   # bands and lines are 300 dpi images, the rest is vector
+#   savefig_many(fig, 'variance', ['png', ('png', 600), 'pdf', 'svg'])
+import pickle
+
+
+def _points(artist):
+    # number of vertices drawn by a line or a collection (e.g. a fill_between band)
+    if hasattr(artist, 'get_xydata'):
+        return len(artist.get_xydata())
+    if hasattr(artist, 'get_paths'):
+        return sum(len(p.vertices) for p in artist.get_paths())
+    return 0
+
+
+def rasterize_layers(fig, min_points=1000):
+    """Rasterize the dense lines and bands of all the axes of fig; return how many were rasterized.
+
+    Only the data layers with at least min_points vertices are rasterized:
+    the axes, ticks, labels, legend and text stay vectors. In a PDF or SVG
+    export they are drawn as an image at the dpi given to savefig(), so
+    that a figure with millions of vertices stays small and fast to open.
+    """
+    n = 0
+    for ax in fig.axes:
+        for artist in list(ax.lines) + list(ax.collections):
+            if _points(artist) >= min_points:
+                artist.set_rasterized(True)
+                n += 1
+    return n
+
+
+def savefig_rasterized(fig, fname, dpi=300, min_points=1000, **kwargs):
+    """Save fig (typically as PDF or SVG) with its dense layers rasterized at `dpi`."""
+    rasterize_layers(fig, min_points)
+    fig.savefig(fname, dpi=dpi, **kwargs)
+
+
+def output_names(base, formats):
+    """The (format, dpi, file name) of each export of savefig_many().
+
+    formats is a list of formats ('png', 'pdf'...) or of (format, dpi)
+    pairs; when a format is requested at several dpi, the dpi is added to
+    the file names, e.g. fig_150dpi.png and fig_600dpi.png.
+    """
+    specs = [f if isinstance(f, tuple) else (f, None) for f in formats]
+    count = {}
+    for fmt, _ in specs:
+        count[fmt] = count.get(fmt, 0) + 1
+    names = []
+    for fmt, dpi in specs:
+        suffix = '_%ddpi' % dpi if count[fmt] > 1 and dpi is not None else ''
+        names.append((fmt, dpi, '%s%s.%s' % (base, suffix, fmt)))
+    return names
+
+
+def _save(args):
+    # runs in a worker process: the figure is sent pickled
+    fig, fname, fmt, dpi = args
+    if isinstance(fig, bytes):
+        fig = pickle.loads(fig)
+    kwargs = {} if dpi is None else {'dpi': dpi}
+    fig.savefig(fname, format=fmt, **kwargs)
+    return fname
+
+
+def savefig_many(fig, base, formats=('png', 'pdf', 'svg'), workers=1, rasterize=False, min_points=1000):
+    """Save a figure, drawn once, in several formats (and dpi); return the file names.
+
+    base is the file name without extension (see output_names() for the
+    formats). With rasterize=True the dense layers are rasterized first (see
+    rasterize_layers()), which only changes the vector formats. With workers > 1
+    (or None for one per core), the figure is pickled once and the formats are
+    encoded in parallel by a pool of processes.
+    """
+    from .data import _map
+    specs = output_names(base, formats)
+    if rasterize:
+        rasterize_layers(fig, min_points)
+    if workers == 1:
+        return [_save((fig, fname, fmt, dpi)) for fmt, dpi, fname in specs]
+    data = pickle.dumps(fig)
+    return list(_map(_save, [(data, fname, fmt, dpi) for fmt, dpi, fname in specs], workers, processes=True))
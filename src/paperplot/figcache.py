@@ -0,0 +1,73 @@
+# content-addressed cache of the rendered figures
+# a figure is only drawn again when its data, its style or the code that draws it changed
+import glob
+import hashlib
+import inspect
+import json
+import os
+import shutil
+
+from . import style
+from .cache import fingerprint
+from .data import list_runs
+
+# the sources of paperplot itself are part of the "plotting code"
+_package_dir = os.path.dirname(os.path.abspath(__file__))
+
+
+def _file_hash(h, path):
+    with open(path, 'rb') as f:
+        h.update(f.read())
+
+
+def code_hash(draw):
+    """Hash the source file of the draw function and the sources of paperplot."""
+    h = hashlib.sha1()
+    source = inspect.getsourcefile(draw)
+    if source is not None:
+        _file_hash(h, source)
+    for path in sorted(glob.glob(os.path.join(_package_dir, '*.py'))):
+        _file_hash(h, path)
+    return h.hexdigest()
+
+
+def job_key(job, dtype=float):
+    """The hash of everything that can change the output of a Job (see paperplot.batch)."""
+    import matplotlib
+    import numpy as np
+    spec = {
+        'data': [fingerprint(list_runs(dir)) for dir in job.data],
+        'dtype': np.dtype(dtype).name,
+        'params': style.params,
+        'figsize': job.figsize,
+        'format': os.path.splitext(job.output)[1],
+        'formats': job.formats,
+        'draw': '%s.%s' % (job.draw.__module__, job.draw.__name__),
+        'code': code_hash(job.draw),
+        'matplotlib': matplotlib.__version__,
+    }
+    return hashlib.sha1(json.dumps(spec, sort_keys=True).encode()).hexdigest()
+
+
+def cached_path(cache_dir, output, key):
+    return os.path.join(cache_dir, key + '_' + os.path.basename(output))
+
+
+def fetch(cache_dir, outputs, key):
+    """Copy the cached files of `key` to `outputs`; return False if they are not all in the cache."""
+    if not all(os.path.exists(cached_path(cache_dir, output, key)) for output in outputs):
+        return False
+    for output in outputs:
+        shutil.copyfile(cached_path(cache_dir, output, key), output)
+    return True
+
+
+def store(cache_dir, outputs, key):
+    """Save the freshly rendered files `outputs` in the cache, under `key`."""
+    if not os.path.isdir(cache_dir):
+        os.makedirs(cache_dir)
+    for output in outputs:
+        path = cached_path(cache_dir, output, key)
+        tmp = '%s.%d.tmp' % (path, os.getpid())
+        shutil.copyfile(output, tmp)
+        os.replace(tmp, path)
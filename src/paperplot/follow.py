@@ -0,0 +1,109 @@
+# incremental loading of experiments that are still running
+# example :
+#   runs = Follower('data/low_mut')
+#   while True:
+#       runs.update()
+#       median, perc_25, perc_75 = perc(runs.data)
+import io
+import os
+
+import numpy as np
+
+from .data import list_runs, load_file
+
+
+class Follower:
+    """Follow the bestfit.dat files of `dir` as the runs append generations to them.
+
+    Each call to update() only reads the bytes appended since the previous
+    call and writes the new values in place in a preallocated matrix, which
+    grows by doubling. New runs are added (as new rows) when they appear;
+    the rows of deleted runs are masked.
+    """
+
+    def __init__(self, dir):
+        self.dir = dir
+        self.files = []
+        self.lengths = np.zeros(0, dtype=int)
+        self._index = {}
+        self._offsets = []
+        # incomplete last line of each file (the run is writing it)
+        self._pending = []
+        self._data = np.full((0, 0), np.nan)
+        self._mask = np.ones((0, 0), dtype=bool)
+        self.update()
+
+    @property
+    def data(self):
+        """Masked (runs x generations) view of the values read so far."""
+        n = self.lengths.max() if len(self.files) > 0 else 0
+        rows = len(self.files)
+        return np.ma.MaskedArray(self._data[:rows, :n], mask=self._mask[:rows, :n])
+
+    def update(self):
+        """Read what was appended since the last call; return the number of new values."""
+        for f in list_runs(self.dir):
+            if f not in self._index:
+                self._add_run(f)
+
+        new = 0
+        for i, f in enumerate(self.files):
+            try:
+                size = os.path.getsize(f)
+                if size < self._offsets[i]:
+                    # the file was truncated (e.g. the run was restarted): read it again
+                    self._reset_run(i)
+                if size == self._offsets[i]:
+                    continue
+                with open(f, 'rb') as fd:
+                    fd.seek(self._offsets[i])
+                    chunk = fd.read(size - self._offsets[i])
+            except FileNotFoundError:
+                # the run was removed: its row stays, fully masked, and is read
+                # again from the start if the file comes back
+                self._reset_run(i)
+                continue
+            self._offsets[i] += len(chunk)
+            chunk = self._pending[i] + chunk
+            end = chunk.rfind(b'\n') + 1
+            self._pending[i] = chunk[end:]
+            if end > 0:
+                values = load_file(io.BytesIO(chunk[:end]))
+                self._append(i, values)
+                new += len(values)
+        return new
+
+    def _add_run(self, f):
+        i = len(self.files)
+        self._index[f] = i
+        self.files.append(f)
+        self._offsets.append(0)
+        self._pending.append(b'')
+        self.lengths = np.append(self.lengths, 0)
+        if i >= self._data.shape[0]:
+            self._grow(max(1, 2 * self._data.shape[0]), self._data.shape[1])
+
+    def _reset_run(self, i):
+        self._offsets[i] = 0
+        self._pending[i] = b''
+        self._data[i, :] = np.nan
+        self._mask[i, :] = True
+        self.lengths[i] = 0
+
+    def _append(self, i, values):
+        start = self.lengths[i]
+        end = start + len(values)
+        if end > self._data.shape[1]:
+            self._grow(self._data.shape[0], max(end, 2 * self._data.shape[1]))
+        self._data[i, start:end] = values
+        self._mask[i, start:end] = False
+        self.lengths[i] = end
+
+    def _grow(self, n_rows, n_cols):
+        data = np.full((n_rows, n_cols), np.nan)
+        mask = np.ones((n_rows, n_cols), dtype=bool)
+        rows, cols = self._data.shape
+        data[:rows, :cols] = self._data
+        mask[:rows, :cols] = self._mask
+        self._data = data
+        self._mask = mask
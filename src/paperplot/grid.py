@@ -0,0 +1,79 @@
+# N x M grids of panels: rows of conditions x columns of zoom windows
+# example :
+#   stats = summarize('data')
+#   plot_grid(fig, stats, windows=[(0, 500), (0, 110)], rows=[['low_mut', 'high_mut']])
+import string
+
+import numpy as np
+
+from .plots import plot_band, style_axes, white_legend
+
+
+def window_slice(x, min_gen, max_gen):
+    """The slice of the (sorted) x that covers [min_gen, max_gen], plus one point on each side.
+
+    Indexing the statistics with this slice gives views (no copy), and the
+    artists of a zoomed panel only hold the points it shows.
+    """
+    start = max(np.searchsorted(x, min_gen, side='left') - 1, 0)
+    end = min(np.searchsorted(x, max_gen, side='right') + 1, len(x))
+    return slice(start, end)
+
+
+def plot_grid(fig, stats, windows, rows=None, x=None, colors=None, labels=None, ylim=None,
+              xtick_step=None, decimate=None, rasterized=False, letters=True):
+    """Draw the statistics of several conditions on a grid of panels; return the axes (rows x columns).
+
+    stats: {condition: (median, perc_25, perc_75)}, computed once (e.g. by summarize())
+    windows: the (min_gen, max_gen) of each column of panels
+    rows: the conditions drawn together in each row (default: one condition per row)
+    x: the generation of each column of the statistics (default: 0, 1, 2...), e.g. the grid of load_aligned()
+    labels: {condition: label} for the legends (default: the names of the conditions)
+    xtick_step: distance between the x ticks (default: chosen by matplotlib)
+    decimate, rasterized: see plot_band(); decimation is done for each panel, at its own resolution
+
+    Each panel only receives the views of the statistics that fall in its
+    window; the y labels are only drawn on the first column and the legend
+    in the first panel of each row.
+    """
+    if colors is None:
+        from .style import colors as default_colors
+        colors = default_colors()
+    conditions = list(stats)
+    if rows is None:
+        rows = [[c] for c in conditions]
+    if labels is None:
+        labels = {}
+    linestyles = ['-', '--', ':', '-.']
+
+    axes = []
+    for r, row in enumerate(rows):
+        axes.append([])
+        for c, (min_gen, max_gen) in enumerate(windows):
+            ax = fig.add_subplot(len(rows), len(windows), r * len(windows) + c + 1)
+            axes[r].append(ax)
+            style_axes(ax)
+            lines = []
+            for k, condition in enumerate(row):
+                median, perc_25, perc_75 = stats[condition][:3]
+                x_c = np.arange(len(median)) if x is None else np.asarray(x)
+                s = window_slice(x_c, min_gen, max_gen)
+                i = conditions.index(condition)
+                line, _ = plot_band(ax, x_c[s], median[s], perc_25[s], perc_75[s],
+                                    color=colors[i % len(colors)], linestyle=linestyles[k % len(linestyles)],
+                                    decimate=decimate, rasterized=rasterized)
+                lines.append(line)
+            ax.set_xlim(min_gen, max_gen)
+            if ylim is not None:
+                ax.set_ylim(*ylim)
+            if xtick_step is not None:
+                ax.set_xticks(np.arange(min_gen, max_gen, xtick_step))
+            if c > 0:
+                ax.set_yticklabels([])
+            elif len(row) > 0:
+                white_legend(ax, lines, [labels.get(cond, cond) for cond in row])
+            if letters:
+                letter = string.ascii_uppercase[(r * len(windows) + c) % 26]
+                ax.text(-0.05 if c > 0 else -0.15, 1.0, letter, weight='bold', transform=ax.transAxes,
+                        horizontalalignment='left', verticalalignment='center')
+    return axes
@@ -0,0 +1,100 @@
+# opt-in timing and memory measurements of the stages of a figure pipeline
+# example :
+#   with profiling('variance.png', output='variance.json'):
+#       data = load('data/low_mut')       # records the 'glob' and 'parse' stages
+#       median, perc_25, perc_75 = perc(data)   # records 'statistics'
+#       [...]
+# outside of profiling(), stage() does nothing and costs (almost) nothing.
+import json
+import sys
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    # not available on Windows
+    resource = None
+
+# the profile being recorded (None: no profiling)
+_current = None
+
+
+def peak_rss():
+    """Peak resident memory of the process so far, in MB (None if unknown).
+
+    This is the peak over the whole life of the process: in a worker that
+    already rendered other figures, it includes their memory too.
+    """
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes everywhere else
+    return rss / 1048576.0 if sys.platform == 'darwin' else rss / 1024.0
+
+
+class Profile:
+    """The stages recorded for one figure (or any job called `name`)."""
+
+    def __init__(self, name):
+        self.name = name
+        self.stages = []
+        # number of stages currently open
+        self._depth = 0
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'seconds': sum(s['seconds'] for s in self.stages if s['depth'] == 0),
+            'peak_rss_mb': peak_rss(),
+            'stages': self.stages,
+        }
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=1)
+
+
+@contextmanager
+def profiling(name, output=None):
+    """Record the stages run in this block; save them as JSON to `output` if given."""
+    global _current
+    previous = _current
+    _current = Profile(name)
+    try:
+        yield _current
+    finally:
+        profile, _current = _current, previous
+        if output is not None:
+            profile.save(output)
+
+
+@contextmanager
+def stage(name, **counts):
+    """Record the wall time, the peak RSS and some counts of a stage.
+
+    peak_rss_mb is the peak of the process so far (see peak_rss());
+    peak_rss_growth_mb is how much the stage raised it, i.e. the memory the
+    stage needed beyond the previous peak (0 if it fit in it).
+
+    The block receives the dict of counts, so that it can add the counts
+    only known at the end (e.g. the number of files found by glob).
+    Nested stages are recorded with their depth.
+    """
+    profile = _current
+    if profile is None:
+        yield counts
+        return
+    record = {'stage': name, 'depth': profile._depth}
+    profile.stages.append(record)
+    profile._depth += 1
+    rss = peak_rss()
+    start = time.perf_counter()
+    try:
+        yield counts
+    finally:
+        profile._depth -= 1
+        record['seconds'] = time.perf_counter() - start
+        record['peak_rss_mb'] = peak_rss()
+        record['peak_rss_growth_mb'] = None if rss is None else record['peak_rss_mb'] - rss
+        record.update(counts)
@@ -0,0 +1,196 @@
+# an index of the runs of an experiment, built from the names of the directories
+# example : data/high_mut/exp_3/node05_2014-07-15_16_42_47_5162/bestfit.dat
+#   -> Run(condition='high_mut', replicate=3, node=5, start='2014-07-15T16:42:47', pid=5162, path=...)
+#
+#   runs = Manifest('data')                 # or Manifest('data', refresh=False) for a finished campaign
+#   load_files(runs.files('high_mut', replicates=range(10), exclude_nodes=[5]))
+import json
+import os
+import re
+from collections import namedtuple
+
+Run = namedtuple('Run', ['condition', 'replicate', 'node', 'start', 'pid', 'path'])
+
+_EXP = re.compile(r'^exp_(\d+)$')
+_NODE = re.compile(r'^node(\d+)_(\d{4}-\d{2}-\d{2})_(\d{2})_(\d{2})_(\d{2})_(\d+)$')
+
+MANIFEST_NAME = '.paperplot_manifest.json'
+# bumped when the layout of the saved table changes; older tables are rebuilt
+MANIFEST_VERSION = 2
+
+
+def parse_run(condition, exp, node_dir, path):
+    """Build a Run from the names of its directories; None if they do not follow the convention."""
+    e = _EXP.match(exp)
+    n = _NODE.match(node_dir)
+    if e is None or n is None:
+        return None
+    start = '%sT%s:%s:%s' % (n.group(2), n.group(3), n.group(4), n.group(5))
+    return Run(condition, int(e.group(1)), int(n.group(1)), start, int(n.group(6)), path)
+
+
+def _node_number(node):
+    # 5, '5', '05' and 'node05' all mean the same node
+    if isinstance(node, str):
+        node = node[4:] if node.startswith('node') else node
+    return int(node)
+
+
+def _subdirs(dir):
+    return sorted(d for d in os.listdir(dir) if not d.startswith('.') and os.path.isdir(os.path.join(dir, d)))
+
+
+class Manifest:
+    """The runs found in root/<condition>/exp_*/node*/bestfit.dat, with their metadata.
+
+    The table is saved in root/.paperplot_manifest.json, with the paths
+    relative to root (so './data' and 'data' share it). update() only lists
+    again the directories whose mtime changed (a new exp_* directory changes
+    the mtime of its condition, a new node* directory the mtime of its
+    exp_* directory) and checks that the indexed files still exist, so
+    refreshing a large campaign is cheap; the queries never touch the file
+    system. This check still costs a few stat() calls per run: with
+    refresh=False, a saved table is used as it is (only its file is read)
+    until update() is called.
+    """
+
+    def __init__(self, root, save=True, refresh=True):
+        self.root = os.path.normpath(root)
+        self.save = save
+        self._path = os.path.join(self.root, MANIFEST_NAME)
+        # everything below is relative to root
+        self._runs = {}
+        # dir -> [mtime_ns, sub-directories] for the condition and exp_* directories
+        self._dirs = {}
+        # node directories without a bestfit.dat (yet)
+        self._pending = set()
+        self._dirty = False
+        try:
+            with open(self._path) as f:
+                cached = json.load(f)
+            if cached.get('version') != MANIFEST_VERSION:
+                raise ValueError(cached.get('version'))
+            self._runs = dict((r[-1], Run(*r)) for r in cached['runs'])
+            self._dirs = cached['dirs']
+            self._pending = set(cached['pending'])
+        except (OSError, ValueError, KeyError, TypeError):
+            # no table yet (or an outdated one): it has to be built
+            refresh = True
+        if refresh:
+            self.update()
+
+    def update(self):
+        """Index the new runs and forget the deleted ones; return the number of runs added or removed."""
+        before = set(self._runs)
+        self._dirty = False
+        conditions = _subdirs(self.root)
+        # forget the conditions that were removed
+        for dir in [d for d in self._dirs if os.sep not in d and d not in conditions]:
+            self._forget(dir)
+        for condition in conditions:
+            for exp in self._rescan(condition):
+                if _EXP.match(exp) is not None:
+                    self._rescan(os.path.join(condition, exp), new=self._pending)
+        # a bestfit.dat removed from a node directory only changes the mtime of that directory
+        for path in [p for p in self._runs if not os.path.exists(os.path.join(self.root, p))]:
+            del self._runs[path]
+            self._pending.add(os.path.dirname(path))
+            self._dirty = True
+        for node_dir in list(self._pending):
+            self._add(node_dir)
+        if self._dirty and self.save:
+            self._write()
+        return len(before ^ set(self._runs))
+
+    def _rescan(self, dir, new=None):
+        # the sub-directories of dir, listed again only if its mtime changed;
+        # the removed ones are forgotten and the new ones are added to `new`
+        mtime = os.stat(os.path.join(self.root, dir)).st_mtime_ns
+        entry = self._dirs.get(dir)
+        if entry is None or entry[0] != mtime:
+            old = set(entry[1]) if entry else set()
+            entry = [mtime, _subdirs(os.path.join(self.root, dir))]
+            self._dirs[dir] = entry
+            self._dirty = True
+            for sub in old - set(entry[1]):
+                self._forget(os.path.join(dir, sub))
+            if new is not None:
+                new.update(os.path.join(dir, sub) for sub in set(entry[1]) - old)
+        return entry[1]
+
+    def _add(self, node_dir):
+        path = os.path.join(node_dir, 'bestfit.dat')
+        if not os.path.exists(os.path.join(self.root, path)):
+            if not os.path.isdir(os.path.join(self.root, node_dir)):
+                self._pending.discard(node_dir)
+                self._dirty = True
+            return
+        self._pending.discard(node_dir)
+        self._dirty = True
+        condition, exp, node = node_dir.split(os.sep)
+        run = parse_run(condition, exp, node, path)
+        if run is not None:
+            self._runs[path] = run
+
+    def _forget(self, dir):
+        # remove everything indexed below dir
+        prefix = dir + os.sep
+        for p in [p for p in self._runs if p.startswith(prefix)]:
+            del self._runs[p]
+        for d in [d for d in self._dirs if d == dir or d.startswith(prefix)]:
+            del self._dirs[d]
+        self._pending = set(p for p in self._pending if not (p == dir or p.startswith(prefix)))
+        self._dirty = True
+
+    def _write(self):
+        table = {
+            'version': MANIFEST_VERSION,
+            'runs': [list(self._runs[p]) for p in sorted(self._runs)],
+            'dirs': self._dirs,
+            'pending': sorted(self._pending),
+        }
+        tmp = '%s.%d.tmp' % (self._path, os.getpid())
+        with open(tmp, 'w') as f:
+            json.dump(table, f)
+        os.replace(tmp, self._path)
+
+    def conditions(self):
+        return sorted(set(r.condition for r in self._runs.values()))
+
+    def runs(self, condition=None, replicates=None, nodes=None, exclude_nodes=None, after=None, before=None):
+        """Return the runs (sorted by path) that match all the given criteria.
+
+        condition: a condition name (e.g. 'high_mut') or a list of names
+        replicates: the replicate numbers to keep (e.g. range(10) for exp_0 to exp_9)
+        nodes / exclude_nodes: nodes to keep / to remove (5 or 'node05')
+        after / before: inclusive bounds of the start time, as 'YYYY-MM-DDTHH:MM:SS' or a prefix
+            of it, which covers the whole period (before='2014-07-15' keeps all the runs of that day)
+        """
+        if isinstance(condition, str):
+            condition = [condition]
+        if replicates is not None:
+            replicates = set(replicates)
+        if nodes is not None:
+            nodes = set(_node_number(n) for n in nodes)
+        if exclude_nodes is not None:
+            exclude_nodes = set(_node_number(n) for n in exclude_nodes)
+        result = []
+        for run in self._runs.values():
+            if condition is not None and run.condition not in condition:
+                continue
+            if replicates is not None and run.replicate not in replicates:
+                continue
+            if nodes is not None and run.node not in nodes:
+                continue
+            if exclude_nodes is not None and run.node in exclude_nodes:
+                continue
+            if after is not None and run.start < after:
+                continue
+            if before is not None and run.start[:len(before)] > before:
+                continue
+            result.append(run._replace(path=os.path.join(self.root, run.path)))
+        return sorted(result, key=lambda r: r.path)
+
+    def files(self, *args, **kwargs):
+        """The bestfit.dat files of runs(...), e.g. for load_files()."""
+        return [r.path for r in self.runs(*args, **kwargs)]
@@ -0,0 +1,143 @@
+# drawing helpers for the object-oriented (matplotlib) API
+# matplotlib is imported inside the functions, so that importing paperplot stays cheap
+from .instrument import stage
+
+
+def new_figure(figsize=None):
+    """Create a figure without going through pyplot (no GUI backend is initialised).
+
+    The figure is not registered in pyplot: it is freed as soon as it is not
+    referenced anymore, and fig.savefig() works as usual.
+    """
+    from matplotlib.figure import Figure
+    return Figure(figsize=figsize)
+
+
+def style_axes(ax):
+    # remove the useless spines and put the grid behind the data
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    ax.spines['left'].set_visible(False)
+    ax.get_xaxis().tick_bottom()
+    ax.get_yaxis().tick_left()
+    ax.tick_params(axis='x', direction='out')
+    ax.tick_params(axis='y', length=0)
+    # offset the spines
+    for spine in ax.spines.values():
+        spine.set_position(('outward', 5))
+    ax.grid(axis='y', color="0.9", linestyle='-', linewidth=1)
+    ax.set_axisbelow(True)
+
+
+def plot_band(ax, x, median, perc_25, perc_75, color, linestyle='-', label=None, decimate=None,
+              rasterized=False):
+    """Draw a median as a line and the 25/75 percentiles as a shaded band.
+
+    With decimate=True, the series are reduced to about one point per pixel of
+    the axes (see paperplot.decimate) before drawing; this assumes that x
+    spans the whole width of the axes. An integer sets the number of bins.
+    With rasterized=True, the line and the band are drawn as an image in
+    vector exports (PDF, SVG), at the dpi given to savefig().
+    """
+    with stage('plot_band', points=len(x), decimate=bool(decimate)):
+        line, band = _plot_band(ax, x, median, perc_25, perc_75, color, linestyle, label, decimate)
+        if rasterized:
+            line.set_rasterized(True)
+            band.set_rasterized(True)
+        return line, band
+
+
+def _plot_band(ax, x, median, perc_25, perc_75, color, linestyle, label, decimate):
+    if decimate:
+        from .decimate import axes_pixels, band_envelope, minmax
+        n_bins = axes_pixels(ax) if decimate is True else decimate
+        x_band, perc_25, perc_75 = band_envelope(x, perc_25, perc_75, n_bins)
+        x, median = minmax(x, median, n_bins)
+        # each value of the envelope holds until the start of the next bin
+        step = 'post'
+    else:
+        x_band = x
+        step = None
+    band = ax.fill_between(x_band, perc_25, perc_75, alpha=0.25, linewidth=0, color=color, step=step)
+    line, = ax.plot(x, median, linewidth=2, linestyle=linestyle, color=color, label=label)
+    return line, band
+
+
+def plot_conditions(ax, stats, x=None, colors=None, decimate=None, rasterized=False):
+    """Draw one band per condition of {condition: (median, perc_25, perc_75)} (see summarize()).
+
+    The colors (by default those of paperplot.style.colors()) are reused
+    when there are more conditions than colors, with another line style.
+    Return the lines, in the order of the conditions, e.g. for white_legend().
+    """
+    if colors is None:
+        from .style import colors as default_colors
+        colors = default_colors()
+    linestyles = ['-', '--', ':', '-.']
+    lines = []
+    for i, (condition, (median, perc_25, perc_75)) in enumerate(stats.items()):
+        x_c = range(len(median)) if x is None else x
+        line, _ = plot_band(ax, x_c, median, perc_25, perc_75, color=colors[i % len(colors)],
+                            linestyle=linestyles[(i // len(colors)) % len(linestyles)],
+                            label=condition, decimate=decimate, rasterized=rasterized)
+        lines.append(line)
+    return lines
+
+
+def white_legend(ax, handles, labels, loc=4):
+    # give the handles explicitly, otherwise the bands may be picked instead of the lines
+    legend = ax.legend(handles, labels, loc=loc)
+    frame = legend.get_frame()
+    frame.set_facecolor('1.0')
+    frame.set_edgecolor('1.0')
+    return legend
+
+
+def shade_significance(ax, x, p, alpha=0.05, color='0.9'):
+    """Shade (behind the data) the spans of x where the p-values are below alpha.
+
+    The shading covers the whole height of the axes; p is typically the
+    result of paperplot.signif.mannwhitney_generations().
+    """
+    return ax.fill_between(x, 0, 1, where=p < alpha, transform=ax.get_xaxis_transform(),
+                           step='mid', color=color, linewidth=0, zorder=0)
+
+
+def bracket_levels(pairs):
+    """Stack the brackets of `pairs` [(x1, x2), ...] so that they never overlap.
+
+    The shortest brackets are placed first, each one on the lowest level
+    where it does not touch any bracket already placed. Return the level of
+    each pair (0 is the lowest).
+    """
+    levels = [None] * len(pairs)
+    placed = []
+    for k in sorted(range(len(pairs)), key=lambda k: abs(pairs[k][1] - pairs[k][0])):
+        a, b = sorted(pairs[k])
+        level = 0
+        while any(l == level and a <= d and c <= b for (c, d), l in placed):
+            level += 1
+        placed.append(((a, b), level))
+        levels[k] = level
+    return levels
+
+
+def draw_brackets(ax, positions, p, y, step, alpha=0.05, color='#aaaaaa'):
+    """Draw the stars of a (N x N) matrix of p-values (see signif.pairwise()) as brackets.
+
+    positions are the x coordinates of the N conditions (e.g. of the boxes),
+    y is the bottom of the lowest bracket and step the vertical distance
+    between two levels. Only the pairs with p < alpha are drawn.
+    """
+    from .signif import stars
+    pairs = [(i, j) for i in range(len(positions)) for j in range(i + 1, len(positions)) if p[i, j] < alpha]
+    levels = bracket_levels([(positions[i], positions[j]) for i, j in pairs])
+    artists = []
+    for (i, j), level in zip(pairs, levels):
+        x1, x2 = positions[i], positions[j]
+        y1 = y + level * step
+        artists += ax.plot([x1, x1, x2, x2], [y1, y1 + step * 0.2, y1 + step * 0.2, y1],
+                           color=color, linewidth=1)
+        artists.append(ax.text((x1 + x2) / 2.0, y1 + step * 0.25, stars(p[i, j]),
+                               horizontalalignment='center', verticalalignment='bottom'))
+    return artists
@@ -0,0 +1,125 @@
+# statistical tests between conditions
+# scipy is imported inside the functions, so that importing paperplot stays cheap
+import numpy as np
+
+
+def stars(p):
+    if p < 0.0001:
+        return "****"
+    elif (p < 0.001):
+        return "***"
+    elif (p < 0.01):
+        return "**"
+    elif (p < 0.05):
+        return "*"
+    else:
+        return "-"
+
+
+def mannwhitney(a, b):
+    """Return the two-tailed p-value of the Mann-Whitney U test between a and b."""
+    import scipy.stats
+    return scipy.stats.mannwhitneyu(a, b, alternative='two-sided').pvalue
+
+
+def stars_array(p):
+    """Vectorized stars(): return an array of strings, one per p-value."""
+    p = np.asarray(p)
+    return np.select([p < 0.0001, p < 0.001, p < 0.01, p < 0.05],
+                     ["****", "***", "**", "*"], "-")
+
+
+def ranks(data):
+    """Average ranks (1-based, ties get the mean of their ranks) of each column."""
+    import scipy.stats
+    return scipy.stats.rankdata(data, axis=0)
+
+
+def _ranksum_test(r_a, n_a, n_b, sum_r2):
+    # normal approximation of the Mann-Whitney U test (with tie and continuity
+    # corrections, like scipy.stats.mannwhitneyu(method='asymptotic')), given the
+    # sum of the ranks of the first sample and the sum of the squared ranks of the pool
+    import scipy.special
+    n = n_a + n_b
+    u = r_a - n_a * (n_a + 1) / 2.0
+    # sum(t^3 - t) over the groups of ties, from the sum of the squared ranks
+    ties = 12.0 * (n * (n + 1) * (2 * n + 1) / 6.0 - sum_r2)
+    var = n_a * n_b / 12.0 * ((n + 1) - ties / (n * (n - 1)))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = (np.abs(u - n_a * n_b / 2.0) - 0.5) / np.sqrt(var)
+    # all the values are equal: nothing can be said
+    z = np.where(var > 0, np.maximum(z, 0), 0)
+    return np.minimum(2 * scipy.special.ndtr(-z), 1.0)
+
+
+def mannwhitney_generations(data_a, data_b):
+    """Two-tailed Mann-Whitney p-value of each generation (column) of two matrices.
+
+    The pooled runs are ranked for all the generations at once, so this costs
+    a single sort of the pooled matrix instead of one scipy call per
+    generation. The p-values come from the normal approximation, which is
+    what mannwhitneyu() uses as soon as there are ties or more than 8 runs.
+    """
+    n_a = data_a.shape[0]
+    r = ranks(np.concatenate((data_a, data_b), axis=0))
+    return _ranksum_test(r[:n_a].sum(axis=0), n_a, data_b.shape[0], (r ** 2).sum(axis=0))
+
+
+def adjust_pvalues(p, method='holm'):
+    """Correct p-values (along the first axis) for multiple comparisons.
+
+    method is 'bonferroni', 'holm' (Holm-Bonferroni, the default), 'fdr_bh'
+    (Benjamini-Hochberg false discovery rate) or None (no correction).
+    """
+    p = np.asarray(p, dtype=float)
+    m = p.shape[0]
+    if method is None or m == 0:
+        return p
+    if method == 'bonferroni':
+        return np.minimum(p * m, 1.0)
+    order = np.argsort(p, axis=0)
+    p_sorted = np.take_along_axis(p, order, axis=0)
+    k = np.arange(1, m + 1).reshape((m,) + (1,) * (p.ndim - 1))
+    if method == 'holm':
+        adjusted = np.maximum.accumulate((m - k + 1) * p_sorted, axis=0)
+    elif method == 'fdr_bh':
+        adjusted = np.minimum.accumulate((m / k * p_sorted)[::-1], axis=0)[::-1]
+    else:
+        raise ValueError('unknown correction method: %r' % (method,))
+    result = np.empty_like(p)
+    np.put_along_axis(result, order, np.minimum(adjusted, 1.0), axis=0)
+    return result
+
+
+def pairwise(samples, correction='holm'):
+    """Compare all the pairs of conditions with Dunn's rank test.
+
+    `samples` is a list of N arrays (one per condition) with the runs along
+    the first axis, e.g. data[:, 100] for one generation or the full
+    (runs x generations) matrices to test every generation. All the samples
+    are ranked together once, and the same ranks are used for the N(N-1)/2
+    pairs; the p-values are then corrected with adjust_pvalues().
+    Return a symmetric (N x N) matrix of two-tailed p-values (N x N x
+    generations for matrices), with ones on the diagonal.
+    """
+    import scipy.special
+    sizes = np.array([len(s) for s in samples])
+    n = sizes.sum()
+    r = ranks(np.concatenate(samples, axis=0))
+    bounds = np.concatenate(([0], np.cumsum(sizes)))
+    mean_ranks = np.array([r[bounds[i]:bounds[i + 1]].mean(axis=0) for i in range(len(samples))])
+    # sum(t^3 - t) over the groups of ties, from the sum of the squared ranks
+    ties = 12.0 * (n * (n + 1) * (2 * n + 1) / 6.0 - (r ** 2).sum(axis=0))
+    var = n * (n + 1) / 12.0 - ties / (12.0 * (n - 1))
+
+    i, j = np.triu_indices(len(samples), k=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = np.abs(mean_ranks[i] - mean_ranks[j]) / np.sqrt(var * (1.0 / sizes[i] + 1.0 / sizes[j]).reshape(
+            (-1,) + (1,) * (mean_ranks.ndim - 1)))
+    z = np.where(var > 0, z, 0)
+    p = adjust_pvalues(2 * scipy.special.ndtr(-z), correction)
+
+    result = np.ones((len(samples), len(samples)) + p.shape[1:])
+    result[i, j] = p
+    result[j, i] = p
+    return result
@@ -0,0 +1,108 @@
+# streaming percentiles, for experiments too big to fit the (runs x generations) matrix in memory
+# example :
+#   median, perc_25, perc_75 = perc_streaming('data/low_mut')
+import numpy as np
+
+from .data import _map, list_runs, load_file
+
+
+class QuantileSketch:
+    """Bounded-memory percentiles of each generation, fed one run at a time.
+
+    This is a compactor sketch (Manku et al. 1999, Karnin et al. 2016) that
+    works on all the generations at once: each level stores at most k values
+    per generation; when a level is full, each column is sorted and every
+    other value is promoted to the next level with a doubled weight. All the
+    generations receive a value per run, so they share the same compaction
+    schedule and a compaction is a single sort of a (k x generations) block.
+
+    Memory is O(k log2(n / k)) values per generation for n runs. As long as
+    n < k, nothing is discarded and the results are exactly those of
+    np.percentile(); see rank_error for the bound afterwards.
+    """
+
+    def __init__(self, k=256):
+        if k < 2 or k % 2 != 0:
+            raise ValueError('k must be an even number >= 2, not %r' % (k,))
+        self.k = k
+        self.n = 0
+        self.n_generations = None
+        self._levels = []
+        self._sizes = []
+        # offset of the next compaction of each level (alternates between 0 and 1)
+        self._offsets = []
+
+    def add(self, run):
+        """Add the values of one run (one value per generation)."""
+        run = np.asarray(run, dtype=float)
+        if self.n_generations is None:
+            self.n_generations = len(run)
+        elif len(run) != self.n_generations:
+            raise ValueError('the run has %d generations instead of %d' % (len(run), self.n_generations))
+        self._push(0, run[np.newaxis, :])
+        self.n += 1
+
+    def _push(self, h, rows):
+        if h == len(self._levels):
+            self._levels.append(np.empty((self.k, self.n_generations)))
+            self._sizes.append(0)
+            self._offsets.append(0)
+        size = self._sizes[h]
+        self._levels[h][size:size + len(rows)] = rows
+        self._sizes[h] = size + len(rows)
+        if self._sizes[h] == self.k:
+            # keep every other value of each sorted column, with a twice bigger weight
+            level = np.sort(self._levels[h], axis=0)
+            self._sizes[h] = 0
+            self._push(h + 1, level[self._offsets[h]::2])
+            self._offsets[h] = 1 - self._offsets[h]
+
+    @property
+    def rank_error(self):
+        """Upper bound of the rank error of the results, as a fraction of n.
+
+        Each compaction of level h moves a rank by at most 2^h and level h is
+        compacted at most n / (k 2^h) times, hence an error of at most
+        (number of compacted levels) / k.
+        """
+        return (len(self._levels) - 1) / self.k
+
+    def quantiles(self, q):
+        """Return the q-th percentiles of each generation, as a (len(q) x generations) array."""
+        q = np.atleast_1d(np.asarray(q, dtype=float))
+        if self.n == 0:
+            raise ValueError('the sketch is empty')
+        if len(self._levels) == 1:
+            # nothing has been compacted yet: this is exact
+            return np.percentile(self._levels[0][:self._sizes[0]], q, axis=0)
+
+        values = np.concatenate([l[:s] for l, s in zip(self._levels, self._sizes)])
+        weights = np.concatenate([np.full(s, 2.0 ** h) for h, s in enumerate(self._sizes)])
+        order = np.argsort(values, axis=0)
+        values = np.take_along_axis(values, order, axis=0)
+        cum = np.cumsum(weights[order], axis=0)
+        total = weights.sum()
+        result = np.empty((len(q), self.n_generations))
+        columns = np.arange(self.n_generations)
+        for i, p in enumerate(q):
+            # first value whose cumulated weight reaches the requested rank
+            rank = p / 100.0 * (total - 1) + 1
+            idx = np.minimum((cum < rank).sum(axis=0), len(values) - 1)
+            result[i] = values[idx, columns]
+        return result
+
+    def perc(self, extra=()):
+        """Return the median, 25th and 75th percentiles of each generation (like stats.perc())."""
+        return tuple(self.quantiles([50, 25, 75] + list(extra)))
+
+
+def perc_streaming(dir, k=256, extra=(), workers=1, processes=False):
+    """Like perc(load(dir)), but without keeping all the runs in memory.
+
+    The runs are parsed (possibly on several workers) and fed one at a time
+    to a QuantileSketch of size k.
+    """
+    sketch = QuantileSketch(k)
+    for run in _map(load_file, list_runs(dir), workers, processes):
+        sketch.add(run)
+    return sketch.perc(extra)
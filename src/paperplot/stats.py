@@ -0,0 +1,89 @@
+# statistics over the runs, for each generation (i.e. each column of the matrix)
+import numpy as np
+
+from .instrument import stage
+
+
+def quantiles(data, q):
+    """Return the q-th percentiles of each generation, as a (len(q) x generations) array.
+
+    All the percentiles are computed in a single pass over the matrix instead
+    of sorting every column once per percentile.
+    Masked values (see load_ragged()) are ignored.
+    """
+    with stage('statistics', generations=data.shape[1], quantiles=len(q)):
+        if np.ma.isMaskedArray(data):
+            return np.nanpercentile(data.filled(np.nan), q, axis=0)
+        return np.percentile(data, q, axis=0)
+
+
+def med(data):
+    # compute the median of each column
+    with stage('statistics', generations=data.shape[1], quantiles=1):
+        if np.ma.isMaskedArray(data):
+            return np.nanmedian(data.filled(np.nan), axis=0)
+        return np.median(data, axis=0)
+
+
+def perc(data, extra=()):
+    """Return the median, 25th and 75th percentiles of each generation.
+
+    Any percentile listed in `extra` is computed in the same pass and appended
+    to the returned tuple, e.g. perc(data, extra=(5, 95)).
+    """
+    q = quantiles(data, [50, 25, 75] + list(extra))
+    return tuple(q)
+
+
+def _bootstrap_chunk(args):
+    # the medians of n bootstrap samples for all the generations at once; the
+    # columns are sorted only once (sorted_data, order): a bootstrap sample is
+    # a number of copies of each run, and its median is found by accumulating
+    # these counts along the sorted columns, without sorting again
+    sorted_data, order, valid, n, seed = args
+    n_runs, n_gens = sorted_data.shape
+    rng = np.random.default_rng(seed)
+    columns = np.arange(n_gens)
+    # small integers make the cumulated counts much faster
+    dtype = np.int16 if n_runs < 2 ** 15 else np.int64
+    result = np.empty((n, n_gens))
+    for b in range(n):
+        counts = np.bincount(rng.integers(0, n_runs, size=n_runs), minlength=n_runs).astype(dtype)
+        copies = counts[order]
+        if valid is not None:
+            # the NaNs (runs that are too short) are sorted last and do not count
+            copies *= valid
+        cum = np.cumsum(copies, axis=0, dtype=dtype)
+        total = cum[-1]
+        # 1-based ranks of the two middle values (the same one if total is odd)
+        lo = np.minimum((cum < (total + 1) // 2).sum(axis=0), n_runs - 1)
+        hi = np.minimum((cum < total // 2 + 1).sum(axis=0), n_runs - 1)
+        with np.errstate(invalid='ignore'):
+            result[b] = np.where(total > 0, (sorted_data[lo, columns] + sorted_data[hi, columns]) / 2.0, np.nan)
+    return result
+
+
+def bootstrap_median(data, n_boot=1000, ci=95, seed=None, workers=1, processes=False, chunk=50):
+    """Return the median of each generation and the bootstrap confidence interval of this median.
+
+    The runs are resampled with replacement n_boot times; each bootstrap
+    sample gives a median for all the generations at once. The samples are
+    split in chunks of `chunk` samples computed on `workers` threads (or
+    processes, see load()). Each chunk has its own random stream derived from
+    `seed`, so the result only depends on the seed, not on the number of workers.
+    Return median, low, high (like perc(), for fill_between()).
+    """
+    from .data import _map
+    if np.ma.isMaskedArray(data):
+        data = data.filled(np.nan)
+    data = np.asarray(data, dtype=float)
+    order = np.argsort(data, axis=0)
+    sorted_data = np.take_along_axis(data, order, axis=0)
+    valid = ~np.isnan(sorted_data) if np.isnan(data).any() else None
+
+    sizes = [chunk] * (n_boot // chunk) + ([n_boot % chunk] if n_boot % chunk else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = [(sorted_data, order, valid, n, s) for n, s in zip(sizes, seeds)]
+    boot = np.concatenate(list(_map(_bootstrap_chunk, jobs, workers, processes)))
+    low, high = np.nanpercentile(boot, [(100 - ci) / 2.0, 100 - (100 - ci) / 2.0], axis=0)
+    return np.nanmedian(data, axis=0), low, high
@@ -0,0 +1,28 @@
+# the style shared by our figures
+# matplotlib and palettable are only imported when a figure is actually drawn
+params = {
+    'axes.labelsize': 8,
+    'font.size': 8,
+    'legend.fontsize': 10,
+    'xtick.labelsize': 10,
+    'ytick.labelsize': 10,
+    'text.usetex': False,
+    'figure.figsize': [4.5, 4.5]
+}
+
+
+def update_params(figsize=None, extra=None):
+    """Apply `params` (plus the optional figsize and extra rcParams) to matplotlib."""
+    import matplotlib
+    p = dict(params)
+    if figsize is not None:
+        p['figure.figsize'] = figsize
+    if extra is not None:
+        p.update(extra)
+    matplotlib.rcParams.update(p)
+
+
+def colors():
+    # the Set2 qualitative palette of C. Brewer (see the README)
+    from palettable.colorbrewer.qualitative import Set2_7
+    return Set2_7.mpl_colors
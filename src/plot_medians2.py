@@ -4,21 +4,18 @@ from pylab import *
 
 def load(dir):
     f_list = glob.glob(dir + '/*/*/bestfit.dat')
-    num_lines = sum(1 for line in open(f_list[0]))
-    i = 0
-    data = np.zeros((len(f_list), num_lines))
-    for f in f_list:
-        data[i, :] = np.loadtxt(f)[:, 1]
-        i += 1
+    # read each file once (second column only); the runs that crashed or are
+    # still running are shorter: their missing generations are NaN
+    runs = [np.loadtxt(f, ndmin=2, usecols=1)[:, 0] for f in f_list]
+    data = np.full((len(runs), max(len(r) for r in runs)), np.nan)
+    for i, r in enumerate(runs):
+        data[i, :len(r)] = r
     return data
 
 
 def med(data):
-    # compute the median of each column
-    median = np.zeros(data.shape[1])
-    for i in range(0, len(median)):
-        median[i] = np.median(data[:, i])
-    return median
+    # compute the median of each column (ignoring the NaN of the shorter runs)
+    return np.nanmedian(data, axis=0)
 
 
 data_low_mut = load('data/low_mut')
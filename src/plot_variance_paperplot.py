@@ -0,0 +1,25 @@
+# the same figure as plot_variance_subplots_ter.py (left panel), using the paperplot package
+import numpy as np
+
+from paperplot import colors, load, new_figure, perc, plot_band, style_axes, update_params, white_legend
+
+update_params()
+colors = colors()
+
+data_low_mut = load('data/low_mut')
+data_high_mut = load('data/high_mut')
+
+x = np.arange(0, data_low_mut.shape[1])
+
+fig = new_figure()
+ax = fig.add_subplot(111)
+style_axes(ax)
+line_low_mut, _ = plot_band(ax, x, *perc(data_low_mut), color=colors[0])
+line_high_mut, _ = plot_band(ax, x, *perc(data_high_mut), color=colors[1], linestyle='--')
+
+ax.set_xlim(-5, 400)
+ax.set_ylim(-5000, 300)
+ax.set_xticks(np.arange(0, 500, 100))
+white_legend(ax, [line_low_mut, line_high_mut], ["Low mutation rate", "High Mutation rate"])
+
+fig.savefig('variance_paperplot.png')